@@ -0,0 +1,734 @@
+"""
+Numba-compiled random walker for Pollard's Rho on Ed25519.
+
+This is an optional backend for pollard_rho_ed25519_fun.py. It performs
+exactly the same walk as the libsodium backend (same partitions, same
+step table, same distinguished points), but the whole inner loop runs as
+machine code instead of one Python-level call per step.
+
+Field elements are stored ref10-style as 10 signed 64-bit limbs in radix
+2^25.5 (alternating 26- and 25-bit limbs). A product of two limbs fits
+comfortably in 64 bits, which matters because Numba has no 128-bit
+integer type for the 5 x 51-bit representation.
+
+Walk points are kept in affine (x, y) form. Each step adds the
+partition's step point with the extended twisted Edwards formula and
+normalises the result with one field inversion, since the partition
+function has to see the canonical encoding.
+
+BatchWalkers steps a whole batch of walkers in lockstep instead, so the
+inversion is shared: Montgomery's trick turns one inversion per walker
+into one per batch plus three multiplications per walker.
+"""
+
+import numpy as np
+from numba import njit
+
+from ecdsa.curves import Ed25519
+from ecdsa.ellipticcurve import PointEdwards
+
+
+# Ed25519 curve parameters (from ecdsa library)
+P = Ed25519.curve.p()  # Field modulus, 2^255 - 19
+D = Ed25519.curve.d()  # Edwards curve constant
+ORDER = Ed25519.order  # Group order, approximately 2^252
+
+NLIMBS = 10
+MASK25 = (1 << 25) - 1
+MASK26 = (1 << 26) - 1
+
+# Same as CYCLE_CHECK in pollard_rho_ed25519_fun.py
+CYCLE_CHECK = 32
+
+# Leaving a cycle doubles the coefficients; walk() stops once they have
+# been doubled this often, well before the int64 deltas could overflow
+SCALE_LIMIT = 1 << 16
+
+
+def fe_from_int(value: int) -> np.ndarray:
+    """
+    Convert an integer in [0, p) to field element limbs.
+
+    Args:
+        value: Field element as an integer
+
+    Returns:
+        Array of 10 int64 limbs
+    """
+    limbs = np.empty(NLIMBS, dtype=np.int64)
+    for i in range(NLIMBS):
+        bits = 26 if i % 2 == 0 else 25
+        limbs[i] = value & ((1 << bits) - 1)
+        value >>= bits
+    return limbs
+
+
+def fe_to_int(limbs: np.ndarray) -> int:
+    """
+    Convert canonical field element limbs back to an integer.
+
+    Args:
+        limbs: Array of 10 int64 limbs
+
+    Returns:
+        Field element as an integer
+    """
+    value = 0
+    shift = 0
+    for i in range(NLIMBS):
+        value += int(limbs[i]) << shift
+        shift += 26 if i % 2 == 0 else 25
+    return value
+
+
+# 2*d, for doubling points in escape_cycle()
+D2 = fe_from_int(2 * D % P)
+
+
+def decode_point(point: bytes) -> tuple:
+    """
+    Decode a compressed point into affine coordinate limbs.
+
+    Args:
+        point: Elliptic curve point (compressed encoding)
+
+    Returns:
+        Tuple of (x, y) limb arrays
+    """
+    decoded = PointEdwards.from_bytes(Ed25519.curve, point)
+    return fe_from_int(decoded.x()), fe_from_int(decoded.y())
+
+
+def encode_point(x: np.ndarray, y: np.ndarray) -> bytes:
+    """
+    Encode canonical affine coordinate limbs as a compressed point.
+
+    Args:
+        x: Canonical x-coordinate limbs
+        y: Canonical y-coordinate limbs
+
+    Returns:
+        32-byte compressed encoding
+    """
+    return (fe_to_int(y) | (int(x[0] & 1) << 255)).to_bytes(32, 'little')
+
+
+def step_table(steps, c_list, d_list) -> tuple:
+    """
+    Convert the step points into the precomputed form used by walk().
+
+    Each step point (x, y) is stored as the three field elements
+    y + x, y - x and 2*d*x*y that the addition formula consumes.
+
+    Args:
+        steps: Step points c*G + d*Q, one per partition (compressed encodings)
+        c_list: Coefficient of G for each partition
+        d_list: Coefficient of Q for each partition
+
+    Returns:
+        Tuple of (points, c, d) arrays
+    """
+    points = np.empty((len(steps), 3, NLIMBS), dtype=np.int64)
+    for i, step in enumerate(steps):
+        decoded = PointEdwards.from_bytes(Ed25519.curve, step)
+        x, y = decoded.x(), decoded.y()
+        points[i, 0] = fe_from_int((y + x) % P)
+        points[i, 1] = fe_from_int((y - x) % P)
+        points[i, 2] = fe_from_int(2 * D * x * y % P)
+    return points, np.array(c_list, dtype=np.int64), np.array(d_list, dtype=np.int64)
+
+
+@njit(cache=True)
+def fe_carry(h, h0, h1, h2, h3, h4, h5, h6, h7, h8, h9):
+    """Carry non-negative unreduced limbs into h, leaving every limb in range."""
+    c = h0 >> 26; h1 += c; h0 &= MASK26
+    c = h1 >> 25; h2 += c; h1 &= MASK25
+    c = h2 >> 26; h3 += c; h2 &= MASK26
+    c = h3 >> 25; h4 += c; h3 &= MASK25
+    c = h4 >> 26; h5 += c; h4 &= MASK26
+    c = h5 >> 25; h6 += c; h5 &= MASK25
+    c = h6 >> 26; h7 += c; h6 &= MASK26
+    c = h7 >> 25; h8 += c; h7 &= MASK25
+    c = h8 >> 26; h9 += c; h8 &= MASK26
+    c = h9 >> 25; h0 += 19 * c; h9 &= MASK25
+    c = h0 >> 26; h1 += c; h0 &= MASK26
+    h[0] = h0; h[1] = h1; h[2] = h2; h[3] = h3; h[4] = h4
+    h[5] = h5; h[6] = h6; h[7] = h7; h[8] = h8; h[9] = h9
+
+
+@njit(cache=True)
+def fe_add(h, f, g):
+    """h = f + g"""
+    fe_carry(h, f[0] + g[0], f[1] + g[1], f[2] + g[2], f[3] + g[3], f[4] + g[4],
+             f[5] + g[5], f[6] + g[6], f[7] + g[7], f[8] + g[8], f[9] + g[9])
+
+
+@njit(cache=True)
+def fe_sub(h, f, g):
+    """h = f - g, computed as f + 2p - g so every limb stays non-negative"""
+    fe_carry(h, f[0] + 0x7ffffda - g[0], f[1] + 0x3fffffe - g[1],
+             f[2] + 0x7fffffe - g[2], f[3] + 0x3fffffe - g[3],
+             f[4] + 0x7fffffe - g[4], f[5] + 0x3fffffe - g[5],
+             f[6] + 0x7fffffe - g[6], f[7] + 0x3fffffe - g[7],
+             f[8] + 0x7fffffe - g[8], f[9] + 0x3fffffe - g[9])
+
+
+@njit(cache=True)
+def fe_neg(h, f):
+    """h = -f, computed as 2p - f"""
+    fe_carry(h, 0x7ffffda - f[0], 0x3fffffe - f[1], 0x7fffffe - f[2], 0x3fffffe - f[3],
+             0x7fffffe - f[4], 0x3fffffe - f[5], 0x7fffffe - f[6], 0x3fffffe - f[7],
+             0x7fffffe - f[8], 0x3fffffe - f[9])
+
+
+@njit(cache=True)
+def fe_copy(h, f):
+    """h = f"""
+    for i in range(NLIMBS):
+        h[i] = f[i]
+
+
+@njit(cache=True)
+def fe_equal(f, g):
+    """f == g, for canonical f and g"""
+    for i in range(NLIMBS):
+        if f[i] != g[i]:
+            return False
+    return True
+
+
+@njit(cache=True)
+def fe_less(f, g):
+    """f < g as integers, for canonical f and g"""
+    for i in range(NLIMBS - 1, -1, -1):
+        if f[i] != g[i]:
+            return f[i] < g[i]
+    return False
+
+
+@njit(cache=True)
+def fe_mul(h, f, g):
+    """h = f * g (h may alias f or g)"""
+    f0 = f[0]; f1 = f[1]; f2 = f[2]; f3 = f[3]; f4 = f[4]
+    f5 = f[5]; f6 = f[6]; f7 = f[7]; f8 = f[8]; f9 = f[9]
+    g0 = g[0]; g1 = g[1]; g2 = g[2]; g3 = g[3]; g4 = g[4]
+    g5 = g[5]; g6 = g[6]; g7 = g[7]; g8 = g[8]; g9 = g[9]
+
+    # Odd limbs sit half a bit above their nominal weight, so odd * odd
+    # products pick up a factor of 2; wrapping past 2^255 costs 19
+    f1_2 = 2 * f1; f3_2 = 2 * f3; f5_2 = 2 * f5; f7_2 = 2 * f7; f9_2 = 2 * f9
+    g1_19 = 19 * g1; g2_19 = 19 * g2; g3_19 = 19 * g3; g4_19 = 19 * g4; g5_19 = 19 * g5
+    g6_19 = 19 * g6; g7_19 = 19 * g7; g8_19 = 19 * g8; g9_19 = 19 * g9
+
+    h0 = (f0 * g0 + f1_2 * g9_19 + f2 * g8_19 + f3_2 * g7_19 + f4 * g6_19
+          + f5_2 * g5_19 + f6 * g4_19 + f7_2 * g3_19 + f8 * g2_19 + f9_2 * g1_19)
+    h1 = (f0 * g1 + f1 * g0 + f2 * g9_19 + f3 * g8_19 + f4 * g7_19
+          + f5 * g6_19 + f6 * g5_19 + f7 * g4_19 + f8 * g3_19 + f9 * g2_19)
+    h2 = (f0 * g2 + f1_2 * g1 + f2 * g0 + f3_2 * g9_19 + f4 * g8_19
+          + f5_2 * g7_19 + f6 * g6_19 + f7_2 * g5_19 + f8 * g4_19 + f9_2 * g3_19)
+    h3 = (f0 * g3 + f1 * g2 + f2 * g1 + f3 * g0 + f4 * g9_19
+          + f5 * g8_19 + f6 * g7_19 + f7 * g6_19 + f8 * g5_19 + f9 * g4_19)
+    h4 = (f0 * g4 + f1_2 * g3 + f2 * g2 + f3_2 * g1 + f4 * g0
+          + f5_2 * g9_19 + f6 * g8_19 + f7_2 * g7_19 + f8 * g6_19 + f9_2 * g5_19)
+    h5 = (f0 * g5 + f1 * g4 + f2 * g3 + f3 * g2 + f4 * g1
+          + f5 * g0 + f6 * g9_19 + f7 * g8_19 + f8 * g7_19 + f9 * g6_19)
+    h6 = (f0 * g6 + f1_2 * g5 + f2 * g4 + f3_2 * g3 + f4 * g2
+          + f5_2 * g1 + f6 * g0 + f7_2 * g9_19 + f8 * g8_19 + f9_2 * g7_19)
+    h7 = (f0 * g7 + f1 * g6 + f2 * g5 + f3 * g4 + f4 * g3
+          + f5 * g2 + f6 * g1 + f7 * g0 + f8 * g9_19 + f9 * g8_19)
+    h8 = (f0 * g8 + f1_2 * g7 + f2 * g6 + f3_2 * g5 + f4 * g4
+          + f5_2 * g3 + f6 * g2 + f7_2 * g1 + f8 * g0 + f9_2 * g9_19)
+    h9 = (f0 * g9 + f1 * g8 + f2 * g7 + f3 * g6 + f4 * g5
+          + f5 * g4 + f6 * g3 + f7 * g2 + f8 * g1 + f9 * g0)
+
+    fe_carry(h, h0, h1, h2, h3, h4, h5, h6, h7, h8, h9)
+
+
+@njit(cache=True)
+def fe_sq(h, f):
+    """h = f * f (h may alias f)"""
+    f0 = f[0]; f1 = f[1]; f2 = f[2]; f3 = f[3]; f4 = f[4]
+    f5 = f[5]; f6 = f[6]; f7 = f[7]; f8 = f[8]; f9 = f[9]
+
+    f0_2 = 2 * f0; f1_2 = 2 * f1; f2_2 = 2 * f2; f3_2 = 2 * f3; f4_2 = 2 * f4
+    f5_2 = 2 * f5; f6_2 = 2 * f6; f7_2 = 2 * f7; f8_2 = 2 * f8; f9_2 = 2 * f9
+    f1_4 = 4 * f1; f3_4 = 4 * f3; f5_4 = 4 * f5; f7_4 = 4 * f7
+    f5_19 = 19 * f5; f6_19 = 19 * f6; f7_19 = 19 * f7; f8_19 = 19 * f8; f9_19 = 19 * f9
+
+    h0 = f0 * f0 + f1_4 * f9_19 + f2_2 * f8_19 + f3_4 * f7_19 + f4_2 * f6_19 + f5_2 * f5_19
+    h1 = f0_2 * f1 + f2_2 * f9_19 + f3_2 * f8_19 + f4_2 * f7_19 + f5_2 * f6_19
+    h2 = f0_2 * f2 + f1_2 * f1 + f3_4 * f9_19 + f4_2 * f8_19 + f5_4 * f7_19 + f6 * f6_19
+    h3 = f0_2 * f3 + f1_2 * f2 + f4_2 * f9_19 + f5_2 * f8_19 + f6_2 * f7_19
+    h4 = f0_2 * f4 + f1_4 * f3 + f2 * f2 + f5_4 * f9_19 + f6_2 * f8_19 + f7_2 * f7_19
+    h5 = f0_2 * f5 + f1_2 * f4 + f2_2 * f3 + f6_2 * f9_19 + f7_2 * f8_19
+    h6 = f0_2 * f6 + f1_4 * f5 + f2_2 * f4 + f3_2 * f3 + f7_4 * f9_19 + f8 * f8_19
+    h7 = f0_2 * f7 + f1_2 * f6 + f2_2 * f5 + f3_2 * f4 + f8_2 * f9_19
+    h8 = f0_2 * f8 + f1_4 * f7 + f2_2 * f6 + f3_4 * f5 + f4 * f4 + f9_2 * f9_19
+    h9 = f0_2 * f9 + f1_2 * f8 + f2_2 * f7 + f3_2 * f6 + f4_2 * f5
+
+    fe_carry(h, h0, h1, h2, h3, h4, h5, h6, h7, h8, h9)
+
+
+@njit(cache=True)
+def fe_sqn(h, f, count):
+    """h = f^(2^count), count >= 1"""
+    fe_sq(h, f)
+    for _ in range(count - 1):
+        fe_sq(h, h)
+
+
+@njit(cache=True)
+def fe_invert(h, z, t0, t1, t2, t3):
+    """h = 1/z = z^(p-2), using t0-t3 as scratch"""
+    fe_sq(t0, z)                            # z^2
+    fe_sqn(t1, t0, 2)                       # z^8
+    fe_mul(t1, z, t1)                       # z^9
+    fe_mul(t0, t0, t1)                      # z^11
+    fe_sq(t2, t0)                           # z^22
+    fe_mul(t1, t1, t2)                      # z^(2^5 - 1)
+    fe_sqn(t2, t1, 5)
+    fe_mul(t1, t2, t1)                      # z^(2^10 - 1)
+    fe_sqn(t2, t1, 10)
+    fe_mul(t2, t2, t1)                      # z^(2^20 - 1)
+    fe_sqn(t3, t2, 20)
+    fe_mul(t2, t3, t2)                      # z^(2^40 - 1)
+    fe_sqn(t2, t2, 10)
+    fe_mul(t1, t2, t1)                      # z^(2^50 - 1)
+    fe_sqn(t2, t1, 50)
+    fe_mul(t2, t2, t1)                      # z^(2^100 - 1)
+    fe_sqn(t3, t2, 100)
+    fe_mul(t2, t3, t2)                      # z^(2^200 - 1)
+    fe_sqn(t2, t2, 50)
+    fe_mul(t1, t2, t1)                      # z^(2^250 - 1)
+    fe_sqn(t1, t1, 5)
+    fe_mul(h, t1, t0)                       # z^(2^255 - 21)
+
+
+@njit(cache=True)
+def fe_batch_invert(z, count, prefix, t):
+    """
+    z[i] = 1/z[i] for i < count, with one fe_invert() for all of them.
+
+    Montgomery's trick, as in batch_inverse(): invert the product once,
+    then peel the individual inverses off it using the prefix products.
+    prefix is scratch with as many rows as z; rows 0-1 and 8-11 of t are
+    used as well.
+    """
+    inverse = t[0]; tmp = t[1]
+    fe_copy(prefix[0], z[0])
+    for i in range(1, count):
+        fe_mul(prefix[i], prefix[i - 1], z[i])
+    fe_invert(inverse, prefix[count - 1], t[8], t[9], t[10], t[11])
+    for i in range(count - 1, 0, -1):
+        fe_mul(tmp, inverse, prefix[i - 1])     # 1 / z[i]
+        fe_mul(inverse, inverse, z[i])          # 1 / (z[0] * ... * z[i - 1])
+        fe_copy(z[i], tmp)
+    fe_copy(z[0], inverse)
+
+
+@njit(cache=True)
+def fe_canonical(h):
+    """Reduce carried limbs of h in place to the unique representative in [0, p)"""
+    # q = 1 exactly when h + 19 overflows 2^255, i.e. when h >= p
+    q = (h[0] + 19) >> 26
+    q = (h[1] + q) >> 25
+    q = (h[2] + q) >> 26
+    q = (h[3] + q) >> 25
+    q = (h[4] + q) >> 26
+    q = (h[5] + q) >> 25
+    q = (h[6] + q) >> 26
+    q = (h[7] + q) >> 25
+    q = (h[8] + q) >> 26
+    q = (h[9] + q) >> 25
+
+    # Subtract q*p by adding 19*q and dropping the 2^255 carry
+    h[0] += 19 * q
+    c = h[0] >> 26; h[1] += c; h[0] &= MASK26
+    c = h[1] >> 25; h[2] += c; h[1] &= MASK25
+    c = h[2] >> 26; h[3] += c; h[2] &= MASK26
+    c = h[3] >> 25; h[4] += c; h[3] &= MASK25
+    c = h[4] >> 26; h[5] += c; h[4] &= MASK26
+    c = h[5] >> 25; h[6] += c; h[5] &= MASK25
+    c = h[6] >> 26; h[7] += c; h[6] &= MASK26
+    c = h[7] >> 25; h[8] += c; h[7] &= MASK25
+    c = h[8] >> 26; h[9] += c; h[8] &= MASK26
+    h[9] &= MASK25
+
+
+@njit(cache=True)
+def point_sum(x, y, step, efgh, t):
+    """
+    Unnormalised sum (x, y) + step.
+
+    Uses the extended twisted Edwards addition for a = -1 with both
+    inputs affine (Z = 1). The sum is (E / G, H / F), and E, F, G, H are
+    left in efgh[0:4]. step holds (y + x, y - x, 2*d*x*y) of the step
+    point. Only rows 8-10 of the scratch array t are used, so efgh may
+    be t itself.
+    """
+    a = t[8]; b = t[9]; c = t[10]
+    e = efgh[0]; f = efgh[1]; g = efgh[2]; h = efgh[3]
+
+    fe_sub(a, y, x)
+    fe_mul(a, a, step[1])                   # A = (y1 - x1) * (y2 - x2)
+    fe_add(b, y, x)
+    fe_mul(b, b, step[0])                   # B = (y1 + x1) * (y2 + x2)
+    fe_mul(c, x, y)
+    fe_mul(c, c, step[2])                   # C = T1 * 2d * T2
+    fe_sub(e, b, a)                         # E = B - A
+    fe_add(h, b, a)                         # H = B + A
+
+    # D = 2 * Z1 * Z2 = 2
+    for i in range(NLIMBS):
+        a[i] = 0
+    a[0] = 2
+    fe_sub(f, a, c)                         # F = D - C
+    fe_add(g, a, c)                         # G = D + C
+
+
+@njit(cache=True)
+def point_normalize(x, y, efgh, inverse, t):
+    """
+    (x, y) = (E / G, H / F) from point_sum(), in canonical form.
+
+    inverse is 1 / (F * G). Only rows 8-9 of the scratch array t are used.
+    """
+    fe_mul(t[8], efgh[1], inverse)          # 1 / G
+    fe_mul(t[9], efgh[2], inverse)          # 1 / F
+    fe_mul(x, efgh[0], t[8])                # x3 = E / G
+    fe_mul(y, efgh[3], t[9])                # y3 = H / F
+    fe_canonical(x)
+    fe_canonical(y)
+
+
+@njit(cache=True)
+def point_add(x, y, step, t):
+    """
+    (x, y) = (x, y) + step in place, with canonical affine output.
+
+    Normalises the point_sum() with a single inversion. t is a
+    (12, NLIMBS) scratch array.
+    """
+    point_sum(x, y, step, t, t)
+    z = t[7]
+    fe_mul(z, t[1], t[2])                   # Z3 = F * G
+    fe_invert(z, z, t[8], t[9], t[10], t[11])
+    point_normalize(x, y, t, z, t)
+
+
+@njit(cache=True)
+def canonicalize(x, acc):
+    """
+    Same as canonicalize() in pollard_rho_ed25519_fun.py, in place.
+
+    acc holds (alpha delta, beta delta, scale) such that the coefficients
+    are scale * (starting coefficient) + delta, so negating the point
+    negates all three.
+    """
+    if x[0] & 1:
+        fe_neg(x, x)
+        fe_canonical(x)
+        acc[0] = -acc[0]
+        acc[1] = -acc[1]
+        acc[2] = -acc[2]
+
+
+@njit(cache=True)
+def finish_step(x, acc, c, d, index):
+    """Account for having added step point index, then canonicalize()"""
+    acc[0] += c[index]
+    acc[1] += d[index]
+    canonicalize(x, acc)
+
+
+@njit(cache=True)
+def walk_step(x, y, acc, points, c, d, s, t):
+    """
+    Same step as iteration_step(), in place. s is a (5, NLIMBS) scratch
+    array, t the scratch array of point_add().
+    """
+    u = s[0]; v = s[1]
+
+    # Same partition as partition_function(): the low byte of y, with
+    # look-ahead until the new point leaves the partition of the step used
+    partition = (y[0] & 0xFF) % 20
+    fe_copy(u, x)
+    fe_copy(v, y)
+    point_add(u, v, points[partition], t)
+    while (v[0] & 0xFF) % 20 == partition:
+        partition = (partition + 1) % 20
+        fe_copy(u, x)
+        fe_copy(v, y)
+        point_add(u, v, points[partition], t)
+    fe_copy(x, u)
+    fe_copy(y, v)
+    finish_step(x, acc, c, d, partition)
+
+
+@njit(cache=True)
+def escape_cycle(x, y, acc, points, c, d, length, s, t):
+    """
+    Same as escape_cycle() in pollard_rho_ed25519_fun.py, in place.
+    """
+    least_x = s[2]; least_y = s[3]
+    fe_copy(least_x, x)
+    fe_copy(least_y, y)
+    least_alpha = acc[0]; least_beta = acc[1]; least_scale = acc[2]
+    for _ in range(length - 1):
+        walk_step(x, y, acc, points, c, d, s, t)
+        if fe_less(y, least_y):
+            fe_copy(least_x, x)
+            fe_copy(least_y, y)
+            least_alpha = acc[0]; least_beta = acc[1]; least_scale = acc[2]
+
+    fe_copy(x, least_x)
+    fe_copy(y, least_y)
+    acc[0] = least_alpha; acc[1] = least_beta; acc[2] = least_scale
+
+    # Double it: add the point to itself, in the same form as a step point
+    fe_add(s[0], y, x)
+    fe_sub(s[1], y, x)
+    fe_mul(s[2], x, y)
+    fe_mul(s[2], s[2], D2)
+    point_add(x, y, s, t)
+    acc[0] *= 2
+    acc[1] *= 2
+    acc[2] *= 2
+    canonicalize(x, acc)
+
+
+@njit(cache=True)
+def walk(x, y, acc, points, c, d, dp_mask, max_steps):
+    """
+    Walk until a distinguished point is reached or max_steps steps are taken.
+
+    The point (x, y) is updated in place, and acc (alpha delta, beta
+    delta, scale) is updated as described in canonicalize(). The walk
+    also stops early once the scale reaches SCALE_LIMIT.
+
+    Returns:
+        Number of steps taken
+    """
+    t = np.empty((12, NLIMBS), dtype=np.int64)
+    s = np.empty((5, NLIMBS), dtype=np.int64)
+    saved = s[4]
+    fe_copy(saved, y)
+    since_saved = 0
+    taken = 0
+    while taken < max_steps:
+        walk_step(x, y, acc, points, c, d, s, t)
+        taken += 1
+        since_saved += 1
+
+        # Canonical points are determined by y alone
+        if fe_equal(y, saved):
+            escape_cycle(x, y, acc, points, c, d, since_saved, s, t)
+            taken += since_saved
+            fe_copy(saved, y)
+            since_saved = 0
+            if abs(acc[2]) >= SCALE_LIMIT:
+                break
+
+        # Same test as is_distinguished(): y bits from 8 upwards
+        low = y[0] | (y[1] << 26)
+        if (low >> 8) & dp_mask == 0:
+            break
+
+        if since_saved == CYCLE_CHECK:
+            fe_copy(saved, y)
+            since_saved = 0
+    return taken
+
+
+def walk_to_distinguished(point: bytes, alpha: int, beta: int, table,
+                          dp_mask: int, max_steps: int) -> tuple:
+    """
+    Drop-in replacement for the libsodium walk_to_distinguished().
+
+    Args:
+        point: Current point P = alpha*G + beta*Q (compressed encoding)
+        alpha: Current alpha coefficient
+        beta: Current beta coefficient
+        table: Step table from step_table()
+        dp_mask: Distinguished point bit mask
+        max_steps: Maximum number of steps to take (at least 1)
+
+    Returns:
+        Tuple of (point, alpha, beta, steps_taken)
+    """
+    points, c, d = table
+    x, y = decode_point(point)
+    acc = np.array([0, 0, 1], dtype=np.int64)
+    taken = walk(x, y, acc, points, c, d, dp_mask, max_steps)
+    alpha = (int(acc[2]) * alpha + int(acc[0])) % ORDER
+    beta = (int(acc[2]) * beta + int(acc[1])) % ORDER
+    return encode_point(x, y), alpha, beta, taken
+
+
+@njit(cache=True)
+def batch_walk(x, y, acc, points, c, d, dp_mask, nsteps, dp_walker, dp_acc, dp_x, dp_y):
+    """
+    Advance every walker of a batch by nsteps steps.
+
+    Walker i is at (x[i], y[i]). Each step is the same as walk_step(),
+    but all walkers add their step points together so that they can
+    share one inversion, which is by far the most expensive part of a
+    step. Cycle checks, acc and distinguished points work as in
+    _walker_cuda.step_kernel(), and so does SCALE_LIMIT.
+
+    Returns:
+        Number of distinguished points met; only as many as the dp_*
+        buffers hold are recorded
+    """
+    count = x.shape[0]
+    efgh = np.empty((count, 4, NLIMBS), dtype=np.int64)
+    new_x = np.empty((count, NLIMBS), dtype=np.int64)
+    new_y = np.empty((count, NLIMBS), dtype=np.int64)
+    z = np.empty((count, NLIMBS), dtype=np.int64)
+    prefix = np.empty((count, NLIMBS), dtype=np.int64)
+    partition = np.empty(count, dtype=np.int64)
+    lanes = np.empty(count, dtype=np.int64)
+    retries = np.empty(count, dtype=np.int64)
+    s = np.empty((5, NLIMBS), dtype=np.int64)
+    t = np.empty((12, NLIMBS), dtype=np.int64)
+
+    # Same cycle check as walk()
+    saved = y.copy()
+    since_saved = np.zeros(count, dtype=np.int64)
+    active = np.ones(count, dtype=np.bool_)
+    for i in range(count):
+        acc[i, 0] = 0
+        acc[i, 1] = 0
+        acc[i, 2] = 1
+
+    found = 0
+    for _ in range(nsteps):
+        # Add every walker's step point, then normalise them all at once
+        m = 0
+        for i in range(count):
+            if active[i]:
+                partition[i] = (y[i, 0] & 0xFF) % 20
+                point_sum(x[i], y[i], points[partition[i]], efgh[i], t)
+                fe_mul(z[m], efgh[i, 1], efgh[i, 2])
+                lanes[m] = i
+                m += 1
+        if m == 0:
+            break
+        fe_batch_invert(z, m, prefix, t)
+        for j in range(m):
+            i = lanes[j]
+            point_normalize(new_x[i], new_y[i], efgh[i], z[j], t)
+
+        # Look-ahead as in walk_step(), each round sharing one inversion,
+        # until no walker lands in the partition of its step again
+        for j in range(m):
+            retries[j] = lanes[j]
+        r = m
+        while r:
+            k = 0
+            for j in range(r):
+                i = retries[j]
+                if (new_y[i, 0] & 0xFF) % 20 == partition[i]:
+                    partition[i] = (partition[i] + 1) % 20
+                    point_sum(x[i], y[i], points[partition[i]], efgh[i], t)
+                    fe_mul(z[k], efgh[i, 1], efgh[i, 2])
+                    retries[k] = i
+                    k += 1
+            r = k
+            if r:
+                fe_batch_invert(z, r, prefix, t)
+                for j in range(r):
+                    i = retries[j]
+                    point_normalize(new_x[i], new_y[i], efgh[i], z[j], t)
+
+        for j in range(m):
+            i = lanes[j]
+            fe_copy(x[i], new_x[i])
+            fe_copy(y[i], new_y[i])
+            finish_step(x[i], acc[i], c, d, partition[i])
+            since_saved[i] += 1
+
+            if fe_equal(y[i], saved[i]):
+                escape_cycle(x[i], y[i], acc[i], points, c, d, since_saved[i], s, t)
+                fe_copy(saved[i], y[i])
+                since_saved[i] = 0
+                if abs(acc[i, 2]) >= SCALE_LIMIT:
+                    active[i] = False
+                    continue
+
+            # Same test as is_distinguished(): y bits from 8 upwards
+            low = y[i, 0] | (y[i, 1] << 26)
+            if (low >> 8) & dp_mask == 0:
+                if found < dp_walker.shape[0]:
+                    dp_walker[found] = i
+                    dp_acc[found] = acc[i]
+                    fe_copy(dp_x[found], x[i])
+                    fe_copy(dp_y[found], y[i])
+                found += 1
+
+            if since_saved[i] == CYCLE_CHECK:
+                fe_copy(saved[i], y[i])
+                since_saved[i] = 0
+    return found
+
+
+class BatchWalkers:
+    """
+    A batch of walkers stepped together on the CPU with batch_walk().
+
+    Same interface as _walker_cuda.CudaWalkers.
+
+    Args:
+        table: Step table from step_table()
+        count: Number of concurrent walkers
+        dp_mask: Distinguished point bit mask
+        capacity: Number of distinguished points a run can report
+    """
+
+    def __init__(self, table, count: int, dp_mask: int, capacity: int):
+        self.points, self.c, self.d = table
+        self.count = count
+        self.dp_mask = dp_mask
+        self.capacity = capacity
+        self.x = np.zeros((count, NLIMBS), dtype=np.int64)
+        self.y = np.zeros((count, NLIMBS), dtype=np.int64)
+        self.acc = np.empty((count, 3), dtype=np.int64)
+
+        # Distinguished points met during a run, as in CudaWalkers
+        self.dp_walker = np.empty(capacity, dtype=np.int64)
+        self.dp_acc = np.empty((capacity, 3), dtype=np.int64)
+        self.dp_x = np.empty((capacity, NLIMBS), dtype=np.int64)
+        self.dp_y = np.empty((capacity, NLIMBS), dtype=np.int64)
+
+    def load(self, indices, points):
+        """
+        Move walkers to new points.
+
+        Args:
+            indices: Indices of the walkers to move
+            points: New points (compressed encodings), one per index
+        """
+        for i, point in zip(indices, points):
+            self.x[i], self.y[i] = decode_point(point)
+
+    def run(self, nsteps: int) -> tuple:
+        """
+        Advance every walker by nsteps steps.
+
+        Args:
+            nsteps: Number of steps per walker
+
+        Returns:
+            Tuple of (hits, deltas, dropped), as returned by CudaWalkers.run()
+        """
+        found = batch_walk(
+            self.x, self.y, self.acc, self.points, self.c, self.d, self.dp_mask, nsteps,
+            self.dp_walker, self.dp_acc, self.dp_x, self.dp_y,
+        )
+
+        hits = []
+        for k in range(min(found, self.capacity)):
+            point = encode_point(self.dp_x[k], self.dp_y[k])
+            acc = self.dp_acc[k]
+            hits.append((int(self.dp_walker[k]), int(acc[2]), int(acc[0]), int(acc[1]), point))
+        return hits, self.acc.copy(), max(found - self.capacity, 0)
@@ -0,0 +1,172 @@
+"""
+CUDA random walkers for Pollard's Rho on Ed25519.
+
+This is an optional backend for pollard_rho_ed25519_fun.py. Thousands of
+independent walkers step concurrently on the GPU, one per thread, each
+taking exactly the same walk as the libsodium and numba backends. The
+field arithmetic is shared with _walker: Numba compiles those @njit
+functions for the device when the kernel calls them.
+
+Walkers stay resident on the device between launches. Each launch runs
+a fixed number of steps per walker and appends every distinguished point
+it meets to a buffer; the host drains that buffer and keeps alpha and
+beta as Python integers, since 252-bit coefficients have no place on
+the GPU. A walker only reports how much it added to its coefficients.
+"""
+
+import numpy as np
+from numba import cuda, int64
+
+import _walker
+from _walker import CYCLE_CHECK, NLIMBS, SCALE_LIMIT, escape_cycle, fe_copy, fe_equal, walk_step
+
+
+THREADS_PER_BLOCK = 128
+
+
+@cuda.jit
+def step_kernel(coords, acc, points, c, d, dp_mask, nsteps,
+                dp_count, dp_walker, dp_acc, dp_coords):
+    """
+    Advance every walker by nsteps steps.
+
+    coords[:, :, i] holds the canonical affine (x, y) limbs of walker i.
+    The change in its coefficients during this launch, as (alpha delta,
+    beta delta, scale) like _walker.walk(), is written to acc[:, i], and
+    every distinguished point is appended to the dp_* buffers together
+    with the change up to that point. Like _walker.walk(), a walker
+    sits out the rest of the launch once its scale reaches SCALE_LIMIT.
+    """
+    i = cuda.grid(1)
+    if i >= coords.shape[2]:
+        return
+
+    x = cuda.local.array(NLIMBS, int64)
+    y = cuda.local.array(NLIMBS, int64)
+    a = cuda.local.array(3, int64)
+    s = cuda.local.array((5, NLIMBS), int64)
+    t = cuda.local.array((12, NLIMBS), int64)
+    for j in range(NLIMBS):
+        x[j] = coords[0, j, i]
+        y[j] = coords[1, j, i]
+    a[0] = 0
+    a[1] = 0
+    a[2] = 1
+
+    # Same cycle check as _walker.walk()
+    saved = s[4]
+    fe_copy(saved, y)
+    since_saved = 0
+    for _ in range(nsteps):
+        walk_step(x, y, a, points, c, d, s, t)
+        since_saved += 1
+
+        if fe_equal(y, saved):
+            escape_cycle(x, y, a, points, c, d, since_saved, s, t)
+            fe_copy(saved, y)
+            since_saved = 0
+            if abs(a[2]) >= SCALE_LIMIT:
+                break
+
+        # Same test as is_distinguished(): y bits from 8 upwards
+        low = y[0] | (y[1] << 26)
+        if (low >> 8) & dp_mask == 0:
+            slot = cuda.atomic.add(dp_count, 0, 1)
+            # A full buffer only drops the report, the walk itself continues
+            if slot < dp_walker.shape[0]:
+                dp_walker[slot] = i
+                for j in range(3):
+                    dp_acc[slot, j] = a[j]
+                for j in range(NLIMBS):
+                    dp_coords[slot, 0, j] = x[j]
+                    dp_coords[slot, 1, j] = y[j]
+
+        if since_saved == CYCLE_CHECK:
+            fe_copy(saved, y)
+            since_saved = 0
+
+    for j in range(NLIMBS):
+        coords[0, j, i] = x[j]
+        coords[1, j, i] = y[j]
+    for j in range(3):
+        acc[j, i] = a[j]
+
+
+class CudaWalkers:
+    """
+    A batch of walkers resident on the GPU.
+
+    Args:
+        table: Step table from _walker.step_table()
+        count: Number of concurrent walkers
+        dp_mask: Distinguished point bit mask
+        capacity: Number of distinguished points a launch can report
+    """
+
+    def __init__(self, table, count: int, dp_mask: int, capacity: int):
+        points, c, d = table
+        self.count = count
+        self.dp_mask = dp_mask
+        self.capacity = capacity
+        self.points = cuda.to_device(points)
+        self.c = cuda.to_device(c)
+        self.d = cuda.to_device(d)
+
+        # Walker state as (coordinate, limb, walker): neighbouring threads
+        # read neighbouring words, so every limb is one coalesced load
+        self.coords = cuda.to_device(np.zeros((2, NLIMBS, count), dtype=np.int64))
+        self.acc = cuda.device_array((3, count), dtype=np.int64)
+
+        # Distinguished points met during a launch, in the order they are met
+        self.dp_count = cuda.device_array(1, dtype=np.int32)
+        self.dp_walker = cuda.device_array(capacity, dtype=np.int64)
+        self.dp_acc = cuda.device_array((capacity, 3), dtype=np.int64)
+        self.dp_coords = cuda.device_array((capacity, 2, NLIMBS), dtype=np.int64)
+
+    def load(self, indices, points):
+        """
+        Move walkers to new points.
+
+        Args:
+            indices: Indices of the walkers to move
+            points: New points (compressed encodings), one per index
+        """
+        coords = self.coords.copy_to_host()
+        for i, point in zip(indices, points):
+            coords[0, :, i], coords[1, :, i] = _walker.decode_point(point)
+        self.coords.copy_to_device(coords)
+
+    def run(self, nsteps: int) -> tuple:
+        """
+        Advance every walker by nsteps steps.
+
+        Args:
+            nsteps: Number of steps per walker
+
+        Returns:
+            Tuple of (hits, deltas, dropped): hits lists (walker, scale,
+            alpha_delta, beta_delta, point) for each distinguished point
+            met, with the change counted from the start of this launch,
+            deltas is a (count, 3) array of (alpha_delta, beta_delta,
+            scale) for the whole launch per walker; the new alpha is
+            scale * alpha + alpha_delta, and likewise for beta. dropped
+            counts the distinguished points that did not fit in capacity.
+        """
+        self.dp_count.copy_to_device(np.zeros(1, dtype=np.int32))
+        blocks = (self.count + THREADS_PER_BLOCK - 1) // THREADS_PER_BLOCK
+        step_kernel[blocks, THREADS_PER_BLOCK](
+            self.coords, self.acc, self.points, self.c, self.d, self.dp_mask, nsteps,
+            self.dp_count, self.dp_walker, self.dp_acc, self.dp_coords,
+        )
+
+        met = int(self.dp_count.copy_to_host()[0])
+        found = min(met, self.capacity)
+        hits = []
+        if found:
+            walkers = self.dp_walker[:found].copy_to_host()
+            acc = self.dp_acc[:found].copy_to_host()
+            coords = self.dp_coords[:found].copy_to_host()
+            for k in range(found):
+                point = _walker.encode_point(coords[k, 0], coords[k, 1])
+                hits.append((int(walkers[k]), int(acc[k, 2]), int(acc[k, 0]), int(acc[k, 1]), point))
+        return hits, self.acc.copy_to_host().T, met - found
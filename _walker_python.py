@@ -0,0 +1,224 @@
+"""
+Pure-Python random walker for Pollard's Rho on Ed25519.
+
+This is an optional backend for pollard_rho_ed25519_fun.py, meant for
+PyPy. It performs exactly the same walk as the other backends, but the
+step loop is nothing but integer arithmetic on small EdPoint objects,
+which PyPy's tracing JIT compiles into a tight loop. The libsodium
+backend instead leaves the JIT for every point addition and allocates
+a bytes object per point.
+
+Points are kept in extended twisted Edwards coordinates (X : Y : Z : T)
+with x = X/Z, y = Y/Z and x*y = T/Z. Walk points are normalised to
+Z = 1 after every step, since the partition function has to see the
+canonical y-coordinate.
+"""
+
+from ecdsa.curves import Ed25519
+from ecdsa.ellipticcurve import PointEdwards
+
+try:
+    from gmpy2 import invert, mpz
+except ImportError:
+    # gmpy2 is optional (and usually missing on PyPy): plain ints work too
+    from ecdsa.numbertheory import inverse_mod as invert
+    mpz = int
+
+
+# Ed25519 curve parameters (from ecdsa library), as GMP integers when
+# available so that all coordinate arithmetic runs in GMP
+P = mpz(Ed25519.curve.p())  # Field modulus, 2^255 - 19
+D = mpz(Ed25519.curve.d())  # Edwards curve constant
+ORDER = mpz(Ed25519.order)  # Group order, approximately 2^252
+D2 = 2 * D % P
+
+# Same as CYCLE_CHECK in pollard_rho_ed25519_fun.py
+CYCLE_CHECK = 32
+
+
+class EdPoint:
+    """
+    A point in extended twisted Edwards coordinates.
+
+    Args:
+        X: X-coordinate, x = X/Z
+        Y: Y-coordinate, y = Y/Z
+        Z: Projective denominator
+        T: Auxiliary coordinate, x*y = T/Z
+    """
+
+    # Fixed attributes keep the objects small and let the JIT see their layout
+    __slots__ = ('X', 'Y', 'Z', 'T')
+
+    def __init__(self, X: int, Y: int, Z: int, T: int):
+        self.X = X
+        self.Y = Y
+        self.Z = Z
+        self.T = T
+
+    @classmethod
+    def from_bytes(cls, point: bytes) -> 'EdPoint':
+        """
+        Decode a compressed point.
+
+        Args:
+            point: Elliptic curve point (compressed encoding)
+
+        Returns:
+            The point with Z = 1
+        """
+        decoded = PointEdwards.from_bytes(Ed25519.curve, point)
+        x, y = decoded.x(), decoded.y()
+        return cls(x, y, 1, x * y % P)
+
+    def to_bytes(self) -> bytes:
+        """
+        Encode the point in compressed form.
+
+        Returns:
+            32-byte compressed encoding
+        """
+        point = self.normalize()
+        return int(point.Y | ((point.X & 1) << 255)).to_bytes(32, 'little')
+
+    def add(self, other: 'EdPoint') -> 'EdPoint':
+        """
+        Add two points with the unified extended coordinate formula for
+        a = -1, so that other may be the point itself.
+
+        Args:
+            other: Point to add
+
+        Returns:
+            self + other, not normalised
+        """
+        a = (self.Y - self.X) * (other.Y - other.X) % P
+        b = (self.Y + self.X) * (other.Y + other.X) % P
+        c = self.T * D2 % P * other.T % P
+        d = 2 * self.Z * other.Z % P
+        e = b - a
+        f = d - c
+        g = d + c
+        h = b + a
+        return EdPoint(e * f % P, g * h % P, f * g % P, e * h % P)
+
+    def negate(self) -> 'EdPoint':
+        """Return -self."""
+        return EdPoint(-self.X % P, self.Y, self.Z, -self.T % P)
+
+    def normalize(self) -> 'EdPoint':
+        """
+        Scale the point to Z = 1.
+
+        Returns:
+            The same point with canonical affine X and Y
+        """
+        inverse = invert(self.Z, P)
+        x = self.X * inverse % P
+        y = self.Y * inverse % P
+        return EdPoint(x, y, 1, x * y % P)
+
+
+def step_table(steps, c_list, d_list) -> tuple:
+    """
+    Convert the step points into the form used by walk_to_distinguished().
+
+    Args:
+        steps: Step points c*G + d*Q, one per partition (compressed encodings)
+        c_list: Coefficient of G for each partition
+        d_list: Coefficient of Q for each partition
+
+    Returns:
+        Tuple of (points, c, d)
+    """
+    return tuple(EdPoint.from_bytes(step) for step in steps), tuple(c_list), tuple(d_list)
+
+
+def canonicalize(point: EdPoint, alpha: int, beta: int) -> tuple:
+    """
+    Same as canonicalize() in pollard_rho_ed25519_fun.py, for a point
+    with Z = 1.
+    """
+    if point.X & 1:
+        point = point.negate()
+        alpha = ORDER - alpha if alpha else 0
+        beta = ORDER - beta if beta else 0
+    return point, alpha, beta
+
+
+def walk_step(point: EdPoint, alpha: int, beta: int, points, c, d) -> tuple:
+    """
+    Same step as iteration_step(), for a point with Z = 1.
+    """
+    # Same partition as partition_function(): the low byte of y, with
+    # look-ahead until the new point leaves the partition of the step used
+    partition = (point.Y & 0xFF) % 20
+    new_point = point.add(points[partition]).normalize()
+    while (new_point.Y & 0xFF) % 20 == partition:
+        partition = (partition + 1) % 20
+        new_point = point.add(points[partition]).normalize()
+
+    alpha += c[partition]
+    beta += d[partition]
+    if alpha >= ORDER:
+        alpha -= ORDER
+    if beta >= ORDER:
+        beta -= ORDER
+    return canonicalize(new_point, alpha, beta)
+
+
+def escape_cycle(point: EdPoint, alpha: int, beta: int, points, c, d, length: int) -> tuple:
+    """
+    Same as escape_cycle() in pollard_rho_ed25519_fun.py.
+    """
+    least = point, alpha, beta
+    for _ in range(length - 1):
+        point, alpha, beta = walk_step(point, alpha, beta, points, c, d)
+        if point.Y < least[0].Y:
+            least = point, alpha, beta
+
+    point, alpha, beta = least
+    return canonicalize(point.add(point).normalize(), 2 * alpha % ORDER, 2 * beta % ORDER)
+
+
+def walk_to_distinguished(point: bytes, alpha: int, beta: int, table,
+                          dp_mask: int, max_steps: int) -> tuple:
+    """
+    Drop-in replacement for the libsodium walk_to_distinguished().
+
+    Args:
+        point: Current point P = alpha*G + beta*Q (compressed encoding)
+        alpha: Current alpha coefficient
+        beta: Current beta coefficient
+        table: Step table from step_table()
+        dp_mask: Distinguished point bit mask
+        max_steps: Maximum number of steps to take (at least 1)
+
+    Returns:
+        Tuple of (point, alpha, beta, steps_taken)
+    """
+    points, c, d = table
+    point = EdPoint.from_bytes(point)
+    saved = point.Y
+    since_saved = 0
+    taken = 0
+    while taken < max_steps:
+        point, alpha, beta = walk_step(point, alpha, beta, points, c, d)
+        taken += 1
+        since_saved += 1
+
+        # Canonical points are determined by y alone
+        if point.Y == saved:
+            point, alpha, beta = escape_cycle(point, alpha, beta, points, c, d, since_saved)
+            taken += since_saved
+            saved = point.Y
+            since_saved = 0
+
+        # Same test as is_distinguished(): y bits from 8 upwards
+        if (point.Y >> 8) & dp_mask == 0:
+            break
+
+        if since_saved == CYCLE_CHECK:
+            saved = point.Y
+            since_saved = 0
+    return point.to_bytes(), alpha, beta, taken
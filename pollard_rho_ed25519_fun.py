@@ -15,11 +15,14 @@ Ed25519 remains secure on classical computers.
 """
 
 import argparse
-import hashlib
 import math
+import multiprocessing
+import platform
+import random
 import sys
+import threading
 import time
-from typing import Tuple, Optional
+from typing import List, Tuple, Optional
 
 try:
     from ecdsa import SigningKey, VerifyingKey
@@ -31,12 +34,95 @@ except ImportError:
     print("  pip install ecdsa")
     sys.exit(1)
 
+try:
+    from nacl.bindings import (
+        crypto_core_ed25519_add,
+        crypto_core_ed25519_is_valid_point,
+        crypto_scalarmult_ed25519_base_noclamp,
+        crypto_scalarmult_ed25519_noclamp,
+    )
+except ImportError:
+    print("Error: PyNaCl library not found. Please install it using:")
+    print("  pip install pynacl")
+    sys.exit(1)
+
+try:
+    from gmpy2 import invert, mpz
+except ImportError:
+    # gmpy2 is optional: Python ints give the same results, only slower
+    invert = inverse_mod
+    mpz = int
+
+# Pure Python, so always available
+import _walker_python
+
+try:
+    import _walker
+except ImportError:
+    # numba is optional and only needed for --backend numba and batch
+    _walker = None
+
+try:
+    import _walker_cuda
+except ImportError:
+    # Likewise for --backend cuda
+    _walker_cuda = None
+
 
 # Ed25519 curve parameters (from ecdsa library)
 CURVE = Ed25519
 G = CURVE.generator
-n = CURVE.order  # Group order, approximately 2^252
-p = CURVE.curve.p()  # Field modulus
+# As GMP integers when gmpy2 is installed, so alpha and beta, which are
+# reduced modulo n, become GMP integers too
+n = mpz(CURVE.order)  # Group order, approximately 2^252
+p = mpz(CURVE.curve.p())  # Field modulus
+
+# Expected iterations until a collision: sqrt(pi*n/4) ≈ 2^126, since the
+# negation map saves a factor of sqrt(2) on sqrt(pi*n/2). Only used for
+# progress estimates, so double precision is plenty.
+_EXPECTED_OPS = math.sqrt(math.pi * float(n) / 4)
+
+# About one point in 2^20 is stored in the distinguished point table
+DEFAULT_DP_BITS = 20
+
+# Update rules for each of the 20 partitions: P_new = P + c*G + d*Q
+# This creates a pseudo-random walk through the group: Teske's r-adding
+# walk, which with r = 20 random steps behaves close to a truly random
+# walk. The negation map needs 20 genuinely different steps as well. The
+# coefficients come from a fixed seed, so every process builds the same
+# walk, and 32 bits keep the coefficient updates cheap.
+_step_rng = random.Random(25519)
+_C = tuple(_step_rng.randrange(1, 1 << 32) for _ in range(20))
+_D = tuple(_step_rng.randrange(1, 1 << 32) for _ in range(20))
+
+# Partition of every possible low byte of a point encoding, so finding a
+# point's partition is a single index instead of a function call
+_PARTITION = bytes(b % 20 for b in range(256))
+
+# Walks check every CYCLE_CHECK steps whether they have come back to the
+# same point, which catches fruitless cycles up to this length
+CYCLE_CHECK = 32
+
+# Implementations of the random walk that can be chosen with --backend
+BACKENDS = ("sodium", "python", "numba", "batch", "cuda")
+
+# PyPy's JIT runs the pure-Python walker far faster than it can call
+# into libsodium, and numba is not available there anyway
+DEFAULT_BACKEND = "python" if platform.python_implementation() == "PyPy" else "sodium"
+
+# Backends that step many walkers at once run this many per worker by
+# default, for up to BATCH_STEPS steps per launch
+DEFAULT_BATCH_WALKERS = 4096
+BATCH_STEPS = 256
+
+# At low --dp-bits, launches are shortened so that a walker meets about
+# this many distinguished points per launch, and the batch has room for
+# twice as many
+BATCH_DPS = 16
+
+# Walkers report back between segments of at most this many steps, which
+# keeps iteration counts accurate when the run is interrupted
+WALK_SEGMENT = 1024
 
 
 def print_separator(char="=", length=70):
@@ -72,6 +158,11 @@ def parse_public_key(pubkey_hex: str):
     # Convert to bytes
     pubkey_bytes = bytes.fromhex(pubkey_hex)
 
+    # The random walk runs on libsodium, which only accepts points of the
+    # prime-order subgroup generated by G
+    if not crypto_core_ed25519_is_valid_point(pubkey_bytes):
+        raise ValueError("Public key is not a valid point in the Ed25519 prime-order subgroup")
+
     # Create VerifyingKey from bytes (ecdsa library handles decompression)
     try:
         # For Ed25519, we need to use the specific curve
@@ -117,24 +208,99 @@ def format_time_remaining(seconds: float) -> str:
         return f"{mantissa:.2f} × 10^{exp} years (longer than the universe! 🌌)"
 
 
-def partition_function(point) -> int:
+def encode_point(point) -> bytes:
     """
-    Partition function for the random walk.
-    Divides points into 20 partitions based on x-coordinate hash.
+    Encode an ecdsa point in the standard 32-byte Ed25519 compressed form.
+
+    This is the representation libsodium works with: the little-endian
+    y-coordinate with the sign of x stored in the top bit.
 
     Args:
         point: Elliptic curve point
 
+    Returns:
+        32-byte compressed encoding
+    """
+    return bytes(point.to_bytes())
+
+
+def encode_scalar(k: int) -> bytes:
+    """
+    Encode a scalar as the 32-byte little-endian string libsodium expects.
+
+    Args:
+        k: Scalar in the range [0, n)
+
+    Returns:
+        32-byte scalar encoding
+    """
+    return int(k).to_bytes(32, 'little')
+
+
+def step_point(c: int, d: int, Q: bytes) -> bytes:
+    """
+    Compute c*G + d*Q with libsodium: the constant step of a partition,
+    or a walker's starting point.
+
+    Args:
+        c: Coefficient of the base point G
+        d: Coefficient of the target point Q
+        Q: Target public key point (compressed encoding)
+
+    Returns:
+        Compressed encoding of c*G + d*Q
+    """
+    point = crypto_scalarmult_ed25519_base_noclamp(encode_scalar(c))
+    if d == 1:
+        # Starting points have d = 1, which needs no scalar multiplication
+        point = crypto_core_ed25519_add(point, Q)
+    elif d:
+        point = crypto_core_ed25519_add(point, crypto_scalarmult_ed25519_noclamp(encode_scalar(d), Q))
+    return point
+
+
+def partition_function(point: bytes) -> int:
+    """
+    Partition function for the random walk.
+    Divides points into 20 partitions based on the low byte of the point encoding.
+
+    The encoding starts with the little-endian y-coordinate, which is
+    already uniformly distributed, so no hashing is needed.
+
+    Args:
+        point: Elliptic curve point (compressed encoding)
+
     Returns:
         Partition number (0-19)
     """
-    # Hash the x-coordinate to determine partition
-    x_bytes = point.x().to_bytes((point.x().bit_length() + 7) // 8, 'big')
-    hash_val = int(hashlib.sha256(x_bytes).hexdigest(), 16)
-    return hash_val % 20
+    return _PARTITION[point[0]]
+
+
+def canonicalize(point: bytes, alpha: int, beta: int) -> Tuple:
+    """
+    Choose the representative of {P, -P} that the walk works with.
+
+    -P has the same y-coordinate as P and the opposite x, so the walk
+    keeps whichever of the two has an even x (sign bit clear), and
+    negates alpha and beta along with the point.
+
+    Args:
+        point: Point P = alpha*G + beta*Q (compressed encoding)
+        alpha: alpha coefficient of P
+        beta: beta coefficient of P
+
+    Returns:
+        Tuple of (point, alpha, beta) for the canonical representative
+    """
+    if point[31] & 0x80:
+        point = point[:31] + bytes((point[31] ^ 0x80,))
+        alpha = n - alpha if alpha else 0
+        beta = n - beta if beta else 0
+    return point, alpha, beta
 
 
-def iteration_step(point_p, alpha: int, beta: int, Q) -> Tuple:
+def iteration_step(point_p: bytes, alpha: int, beta: int, steps, _C=_C, _D=_D,
+                   _PARTITION=_PARTITION) -> Tuple:
     """
     Perform one iteration step of the random walk.
 
@@ -142,173 +308,687 @@ def iteration_step(point_p, alpha: int, beta: int, Q) -> Tuple:
     - Each partition defines a different update rule
     - P = alpha * G + beta * Q
 
+    The walk runs on classes {P, -P} (the negation map), which halves the
+    space it has to cover. If the step would land in the same partition
+    again, the next partition's step is tried instead, and so on until
+    the new point is in a different partition than the step used, since
+    that is how most fruitless 2-cycles start.
+
+    Points are kept in compressed form and added with libsodium, so the
+    group operation runs in native code on extended twisted Edwards
+    coordinates instead of in the ecdsa library's pure-Python arithmetic.
+
     Args:
-        point_p: Current point P = alpha*G + beta*Q
+        point_p: Current point P = alpha*G + beta*Q (compressed encoding)
         alpha: Current alpha coefficient
         beta: Current beta coefficient
-        Q: Target public key point
+        steps: Precomputed step points c*G + d*Q, one per partition
+        _C: Coefficient of G for each partition (bound as a default so
+            the lookup is a fast local instead of a global)
+        _D: Coefficient of Q for each partition (likewise)
+        _PARTITION: Partition of each low byte, as in partition_function()
+            (likewise)
 
     Returns:
         Tuple of (new_point, new_alpha, new_beta)
     """
-    partition = partition_function(point_p)
-
-    # Define different update rules for each partition
-    # This creates a pseudo-random walk through the group
-    c_list = [1, 1, 1, 1, 1, 1, 1, 1, 1, 1,
-              2, 2, 2, 2, 2, 2, 2, 2, 2, 2]
-    d_list = [0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
-              1, 1, 1, 1, 1, 1, 1, 1, 1, 1]
-
-    c = c_list[partition]
-    d = d_list[partition]
+    # partition_function(), inlined since it runs at least twice per step
+    partition = _PARTITION[point_p[0]]
 
     # P_new = P + c*G + d*Q
     # This means: alpha_new = alpha + c, beta_new = beta + d
-    new_point = point_p + c * G + d * Q
-    new_alpha = (alpha + c) % n
-    new_beta = (beta + d) % n
+    new_point = crypto_core_ed25519_add(point_p, steps[partition])
+    while _PARTITION[new_point[0]] == partition:
+        partition = (partition + 1) % 20
+        new_point = crypto_core_ed25519_add(point_p, steps[partition])
+
+    c = _C[partition]
+    d = _D[partition]
+    new_alpha = alpha + c
+    new_beta = beta + d
+
+    # alpha and beta stay below n and c, d are far smaller, so at most one
+    # subtraction brings them back into range; much cheaper than % n
+    if new_alpha >= n:
+        new_alpha -= n
+    if new_beta >= n:
+        new_beta -= n
 
-    return new_point, new_alpha, new_beta
+    return canonicalize(new_point, new_alpha, new_beta)
 
 
-def solve_ecdlp_pollard_rho(Q, max_iterations: Optional[int] = None, log_interval: int = 10**6):
+def escape_cycle(point: bytes, alpha: int, beta: int, steps, length: int) -> Tuple:
     """
-    Solve ECDLP using Pollard's Rho algorithm with Floyd's cycle detection.
+    Leave a fruitless cycle of the negation map.
+
+    Walking on {P, -P} classes can fall into short cycles where the steps
+    cancel out. Every walk that falls into the same cycle has to leave it
+    the same way, or two merged walks would drift apart again, so the
+    walk leaves by doubling the cycle point with the smallest
+    y-coordinate. Adding yet another fixed step instead would tend to
+    lead straight into the mirror image of the same cycle.
+
+    Args:
+        point: A point on the cycle (compressed encoding)
+        alpha: Current alpha coefficient
+        beta: Current beta coefficient
+        steps: Precomputed step points c*G + d*Q, one per partition
+        length: Length of the cycle
+
+    Returns:
+        Tuple of (point, alpha, beta) just past the cycle
+    """
+    least = point, alpha, beta
+    least_y = int.from_bytes(point, 'little')
+    for _ in range(length - 1):
+        point, alpha, beta = iteration_step(point, alpha, beta, steps)
+        y = int.from_bytes(point, 'little')
+        if y < least_y:
+            least = point, alpha, beta
+            least_y = y
+
+    point, alpha, beta = least
+    return canonicalize(crypto_core_ed25519_add(point, point), 2 * alpha % n, 2 * beta % n)
 
-    Given Q = k*G, find k.
+
+def is_distinguished(point: bytes, dp_mask: int) -> bool:
+    """
+    Check whether a point is a distinguished point.
+
+    A point is distinguished when the bits of its y-coordinate selected by
+    dp_mask, counted from the second byte of the encoding, are all zero, so
+    about one point in every dp_mask + 1 qualifies. The first byte is left
+    to the partition function so the two stay independent.
+
+    Args:
+        point: Elliptic curve point (compressed encoding)
+        dp_mask: Bit mask of the bits that must be zero
+
+    Returns:
+        True if the point is distinguished
+    """
+    return int.from_bytes(point[1:5], 'little') & dp_mask == 0
+
+
+def walk_to_distinguished(point: bytes, alpha: int, beta: int, steps,
+                          dp_mask: int, max_steps: int) -> Tuple:
+    """
+    Walk until a distinguished point is reached or max_steps steps are taken.
 
     Args:
+        point: Current point P = alpha*G + beta*Q (compressed encoding)
+        alpha: Current alpha coefficient
+        beta: Current beta coefficient
+        steps: Precomputed step points c*G + d*Q, one per partition
+        dp_mask: Distinguished point bit mask
+        max_steps: Maximum number of steps to take (at least 1)
+
+    Returns:
+        Tuple of (point, alpha, beta, steps_taken)
+    """
+    taken = 0
+    saved = point
+    since_saved = 0
+    while taken < max_steps:
+        point, alpha, beta = iteration_step(point, alpha, beta, steps)
+        taken += 1
+        since_saved += 1
+
+        # Back at the saved point: the walk is going round a fruitless cycle
+        if point == saved:
+            point, alpha, beta = escape_cycle(point, alpha, beta, steps, since_saved)
+            taken += since_saved
+            saved = point
+            since_saved = 0
+
+        if is_distinguished(point, dp_mask):
+            break
+
+        if since_saved == CYCLE_CHECK:
+            saved = point
+            since_saved = 0
+    return point, alpha, beta, taken
+
+
+def batch_inverse(values: List[int]) -> List[int]:
+    """
+    Invert several nonzero numbers modulo n with a single modular inverse.
+
+    Montgomery's trick: invert the product of all values once, then peel
+    the individual inverses off it using the prefix products, for three
+    multiplications per value instead of one inverse each.
+
+    Args:
+        values: Nonzero integers modulo n
+
+    Returns:
+        The inverse of each value modulo n, in the same order
+    """
+    # prefix[i] is the product of the first i values
+    prefix = [1]
+    for value in values:
+        prefix.append(prefix[-1] * value % n)
+
+    inverse = invert(prefix[-1], n)
+    inverses = [0] * len(values)
+    for i in range(len(values) - 1, -1, -1):
+        inverses[i] = inverse * prefix[i] % n
+        inverse = inverse * values[i] % n
+    return inverses
+
+
+def solve_collisions(collisions: List[Tuple[Tuple[int, int], Tuple[int, int]]], Q) -> Optional[int]:
+    """
+    Recover k from pairs of different representations of the same point.
+
+    For each pair we have: alpha_1 * G + beta_1 * Q = alpha_2 * G + beta_2 * Q
+    This gives us: (alpha_1 - alpha_2) * G = (beta_2 - beta_1) * Q
+    Since Q = k * G: k = (alpha_1 - alpha_2) * inv(beta_2 - beta_1) mod n
+
+    Batched walkers can report several collisions at once, so all the
+    inverses are taken together with batch_inverse().
+
+    Args:
+        collisions: ((alpha, beta) of the first walk to reach a point,
+                     (alpha, beta) of the second walk to reach it) pairs
         Q: Target public key point
-        max_iterations: Maximum iterations to attempt (None for infinite)
-        log_interval: Print progress every N iterations
 
     Returns:
-        The private key k if found, None otherwise
+        The private key k, or None if every collision is trivial
     """
-    print()
-    print("Starting Pollard's Rho algorithm...")
-    print(f"Target point Q: ({Q.x()}, {Q.y()})")
-    print(f"Group order n: {n}")
-    print(f"Bit length of n: {n.bit_length()}")
-    print()
+    alpha_diffs = []
+    beta_diffs = []
+    for first, second in collisions:
+        beta_diff = (second[1] - first[1]) % n
+
+        # Trivial collision: the same walk met itself, nothing to solve
+        if beta_diff == 0:
+            continue
+
+        alpha_diffs.append((first[0] - second[0]) % n)
+        beta_diffs.append(beta_diff)
+
+    if not beta_diffs:
+        return None
+
+    for alpha_diff, beta_inverse in zip(alpha_diffs, batch_inverse(beta_diffs)):
+        k = (alpha_diff * beta_inverse) % n
+
+        # Verify the solution
+        if k * G == Q:
+            return k
+    return None
+
+
+def solve_collision(first: Tuple[int, int], second: Tuple[int, int], Q) -> Optional[int]:
+    """
+    Recover k from two different representations of the same point.
+
+    Args:
+        first: (alpha, beta) of the first walk to reach the point
+        second: (alpha, beta) of the second walk to reach the point
+        Q: Target public key point
+
+    Returns:
+        The private key k, or None if the collision is trivial
+    """
+    return solve_collisions([(first, second)], Q)
 
-    # Initialize tortoise and hare at the same starting point
-    # P = alpha * G + beta * Q
-    start_alpha = 1
-    start_beta = 1
-    start_point = start_alpha * G + start_beta * Q
 
-    # Tortoise moves 1 step at a time
-    tortoise_point = start_point
-    tortoise_alpha = start_alpha
-    tortoise_beta = start_beta
+def print_progress(label: str, workers: int, iteration: int, ops_per_sec: float, dp_count: int):
+    """
+    Print a progress report for one worker process.
+
+    Args:
+        label: First line of the report, identifying the worker
+        workers: Total number of worker processes
+        iteration: Iterations completed by this worker
+        ops_per_sec: Current speed of this worker
+        dp_count: Number of distinguished points found so far
+    """
+    # Estimate remaining time, assuming every worker runs at this speed
+    total_iterations = iteration * workers
+    total_ops_per_sec = ops_per_sec * workers
+    remaining_ops = _EXPECTED_OPS - total_iterations
+    remaining_seconds = remaining_ops / total_ops_per_sec if total_ops_per_sec > 0 else float('inf')
+
+    # Calculate progress (this will be hilariously small)
+    progress = (total_iterations / _EXPECTED_OPS) * 100
+
+    print("\n".join([
+        "",
+        "  " + "─" * 60,
+        f"  {label}",
+        f"  Iteration: {iteration:,}",
+        f"  Speed: ~{ops_per_sec:,.0f} ops/sec (~{total_ops_per_sec:,.0f} ops/sec across all walkers)",
+        f"  Progress: {progress:.15e}%",
+        f"  Estimated remaining time: {format_time_remaining(remaining_seconds)}",
+        f"  Distinguished points: {dp_count:,}",
+        f"  Status: 🦘 Walkers are still hopping... no collision yet!",
+        "  " + "─" * 60,
+        "",
+    ]), flush=True)
+
+
+def run_walker(worker_id: int, workers: int, Q, walk, steps, dp_table, found,
+               max_iterations: Optional[int], log_interval: int, dp_bits: int) -> Optional[int]:
+    """
+    Run one random walker and report its distinguished points.
+
+    Every walker starts from its own point alpha*G + beta*Q and walks
+    until it reaches a distinguished point, which is stored in the shared
+    table keyed by its encoding. When a point is already in the table
+    with different coefficients, two walks have met and k can be solved.
+
+    Args:
+        worker_id: Index of this walker (0-based)
+        workers: Total number of walkers
+        Q: Target public key point
+        walk: walk_to_distinguished() implementation of the chosen backend
+        steps: Step table in the form expected by walk
+        dp_table: Shared mapping of distinguished point -> (alpha, beta)
+        found: Shared event set once any walker has found k
+        max_iterations: Maximum iterations for this walker (None for infinite)
+        log_interval: Print progress every N iterations
+        dp_bits: Number of low bits that must be zero in a distinguished point
 
-    # Hare moves 2 steps at a time
-    hare_point = start_point
-    hare_alpha = start_alpha
-    hare_beta = start_beta
+    Returns:
+        The private key k if found by this walker, None otherwise
+
+    Raises:
+        KeyboardInterrupt: When interrupted, after reporting the iterations done
+    """
+    dp_mask = (1 << dp_bits) - 1
+
+    # A walk that goes this long without a distinguished point is almost
+    # certainly stuck in a cycle that contains none, so it is restarted
+    max_walk_length = 20 << dp_bits
+
+    # Walkers use distinct alpha values, advancing by the walker count on
+    # restart so they never share a starting point. The starting point is
+    # kept as well, so a restart only has to add workers*G to it. Like the
+    # walk, this runs in libsodium rather than the ecdsa library.
+    q_bytes = encode_point(Q)
+    start_alpha = mpz(1 + worker_id)
+    start_beta = mpz(1)
+    start_point = step_point(start_alpha, start_beta, q_bytes)
+    offset = step_point(workers, 0, q_bytes)
+    point, alpha, beta = canonicalize(start_point, start_alpha, start_beta)
 
     iteration = 0
-    start_time = time.time()
-    last_log_time = start_time
+    walk_length = 0
+    next_log = log_interval
+    last_log_time = time.time()
 
     try:
-        while True:
-            # Move tortoise 1 step
-            tortoise_point, tortoise_alpha, tortoise_beta = iteration_step(
-                tortoise_point, tortoise_alpha, tortoise_beta, Q
-            )
+        while not found.is_set():
+            budget = min(next_log - iteration, max_walk_length - walk_length, WALK_SEGMENT)
+            if max_iterations:
+                budget = min(budget, max_iterations - iteration)
 
-            # Move hare 2 steps
-            hare_point, hare_alpha, hare_beta = iteration_step(
-                hare_point, hare_alpha, hare_beta, Q
-            )
-            hare_point, hare_alpha, hare_beta = iteration_step(
-                hare_point, hare_alpha, hare_beta, Q
+            point, alpha, beta, taken = walk(
+                point, alpha, beta, steps, dp_mask, budget
             )
+            iteration += taken
+            walk_length += taken
+
+            restart = False
+            if is_distinguished(point, dp_mask):
+                entry = (alpha, beta)
+                previous = dp_table.get(point)
+                if previous is None:
+                    # setdefault() in case another worker stored it meanwhile
+                    previous = dp_table.setdefault(point, entry)
+                    if previous == entry:
+                        # New distinguished point, the walk goes on from it
+                        walk_length = 0
+                        previous = None
+
+                if previous == entry:
+                    # The walk came back to a point it stored itself: it is
+                    # caught in a fruitless cycle through distinguished points
+                    print(f"  Walker #{worker_id}: revisited its own distinguished point, restarting...",
+                          flush=True)
+                    restart = True
+
+                elif previous is not None:
+                    # Collision found! Now solve for k
+                    k = solve_collision(previous, entry, Q)
+                    if k is not None:
+                        found.set()
+                        return k
 
-            iteration += 1
+                    # Trivial collision, restart with different parameters
+                    print(f"  Walker #{worker_id}: trivial collision detected, restarting...", flush=True)
+                    restart = True
 
-            # Check for collision (tortoise == hare)
-            # We compare the x and y coordinates
-            if (tortoise_point.x() == hare_point.x() and
-                tortoise_point.y() == hare_point.y()):
+            elif walk_length >= max_walk_length:
+                print(f"  Walker #{worker_id}: stuck in a cycle without distinguished points, restarting...",
+                      flush=True)
+                restart = True
 
-                # Collision found! Now solve for k
-                # We have: P = alpha_t * G + beta_t * Q = alpha_h * G + beta_h * Q
-                # This gives us: (alpha_t - alpha_h) * G = (beta_h - beta_t) * Q
-                # Since Q = k * G: (alpha_t - alpha_h) * G = (beta_h - beta_t) * k * G
-                # Therefore: k = (alpha_t - alpha_h) * inv(beta_h - beta_t) mod n
+            if restart:
+                start_alpha = (start_alpha + workers) % n
+                start_point = crypto_core_ed25519_add(start_point, offset)
+                point, alpha, beta = canonicalize(start_point, start_alpha, start_beta)
+                walk_length = 0
 
-                beta_diff = (hare_beta - tortoise_beta) % n
-                alpha_diff = (tortoise_alpha - hare_alpha) % n
+            # Print progress log
+            if iteration >= next_log:
+                next_log += log_interval
+                current_time = time.time()
+                elapsed = current_time - last_log_time
+                ops_per_sec = log_interval / elapsed if elapsed > 0 else 0
+                last_log_time = current_time
 
-                if beta_diff == 0:
-                    # Trivial collision, restart with different parameters
-                    print("  Trivial collision detected, restarting...")
-                    start_alpha = (start_alpha + 1) % n
-                    start_point = start_alpha * G + start_beta * Q
-                    tortoise_point = hare_point = start_point
-                    tortoise_alpha = hare_alpha = start_alpha
-                    tortoise_beta = hare_beta = start_beta
-                    continue
+                print_progress(f"Walker: #{worker_id} of {workers}", workers, iteration, ops_per_sec, len(dp_table))
 
-                try:
-                    k = (alpha_diff * inverse_mod(beta_diff, n)) % n
+            # Check max iterations
+            if max_iterations and iteration >= max_iterations:
+                break
 
-                    # Verify the solution
-                    if k * G == Q:
-                        return k
-                except ValueError:
-                    # Inverse doesn't exist (beta_diff shares factor with n)
-                    pass
+    except KeyboardInterrupt:
+        print(f"  Walker #{worker_id} completed {iteration:,} iterations before giving up.", flush=True)
+        raise
+
+    return None
+
+
+def run_batch_walker(worker_id: int, workers: int, Q, walker_class, table, count: int, dp_table, found,
+                     max_iterations: Optional[int], log_interval: int, dp_bits: int) -> Optional[int]:
+    """
+    Run a batch of random walkers that step together, e.g. on a GPU.
+
+    This is run_walker() for backends that advance many walkers at once:
+    every walker takes the same walk and feeds the same distinguished
+    point table, but the batch only reports distinguished points and how
+    much each walker added to its coefficients. alpha and beta stay here
+    as Python integers.
 
-                # Collision didn't yield valid solution, restart
-                start_alpha = (start_alpha + 1) % n
-                start_point = start_alpha * G + start_beta * Q
-                tortoise_point = hare_point = start_point
-                tortoise_alpha = hare_alpha = start_alpha
-                tortoise_beta = hare_beta = start_beta
+    Args:
+        worker_id: Index of this worker process (0-based)
+        workers: Total number of worker processes
+        Q: Target public key point
+        walker_class: Batch implementation of the chosen backend
+        table: Step table in the form expected by walker_class
+        count: Number of walkers in the batch
+        dp_table: Shared mapping of distinguished point -> (alpha, beta)
+        found: Shared event set once any walker has found k
+        max_iterations: Maximum iterations for this worker (None for infinite)
+        log_interval: Print progress every N iterations
+        dp_bits: Number of low bits that must be zero in a distinguished point
+
+    Returns:
+        The private key k if found by this worker, None otherwise
+
+    Raises:
+        KeyboardInterrupt: When interrupted, after reporting the iterations done
+    """
+    dp_mask = (1 << dp_bits) - 1
+    max_walk_length = 20 << dp_bits
+
+    # A launch meets launch_steps / 2^dp_bits distinguished points per
+    # walker on average; leave room for twice that, plus some slack for
+    # small batches
+    launch_steps = min(BATCH_STEPS, BATCH_DPS << dp_bits)
+    capacity = 2 * count * -(-launch_steps >> dp_bits) + 64
+    walkers = walker_class(table, count, dp_mask, capacity)
+
+    # Walker j of this process starts at alpha = 1 + worker_id + j*workers,
+    # and restarts keep taking alpha values from the same sequence, so no
+    # two walkers in any process share a starting point
+    start_beta = mpz(1)
+    alphas = [mpz(1 + worker_id + j * workers) for j in range(count)]
+    betas = [start_beta] * count
+    next_alpha = mpz(1 + worker_id + count * workers)
+
+    # Consecutive starting points differ by workers*G, so one point
+    # addition each is enough, for restarts too: next_point is always
+    # next_alpha*G + start_beta*Q
+    q_bytes = encode_point(Q)
+    next_point = step_point(alphas[0], start_beta, q_bytes)
+    offset = step_point(workers, 0, q_bytes)
+    points = []
+    for j in range(count):
+        encoded, alphas[j], betas[j] = canonicalize(next_point, alphas[j], betas[j])
+        points.append(encoded)
+        next_point = crypto_core_ed25519_add(next_point, offset)
+    walkers.load(range(count), points)
+
+    walk_lengths = [0] * count
+    iteration = 0
+    next_log = log_interval
+    last_log_iteration = 0
+    last_log_time = time.time()
+
+    try:
+        while not found.is_set():
+            # Keep launches short enough to log on time
+            nsteps = min(launch_steps, max(1, (next_log - iteration) // count))
+            if max_iterations:
+                nsteps = min(nsteps, -(-(max_iterations - iteration) // count))
+
+            hits, deltas, dropped = walkers.run(nsteps)
+            iteration += nsteps * count
+            if dropped:
+                print(f"  Worker #{worker_id}: {dropped:,} distinguished points did not fit in the batch "
+                      f"buffer and were dropped", flush=True)
+
+            restarts = set()
+            collisions = []
+            revisits = 0
+            for walker, scale, alpha_delta, beta_delta, point in hits:
+                entry = ((scale * alphas[walker] + alpha_delta) % n, (scale * betas[walker] + beta_delta) % n)
+                previous = dp_table.get(point)
+                if previous is None:
+                    # Same as in run_walker()
+                    previous = dp_table.setdefault(point, entry)
+                    if previous == entry:
+                        walk_lengths[walker] = 0
+                        continue
+
+                if previous == entry:
+                    revisits += walker not in restarts
+                    restarts.add(walker)
+                else:
+                    collisions.append((previous, entry))
+                    restarts.add(walker)
+
+            if revisits:
+                print(f"  Worker #{worker_id}: {revisits:,} walkers revisited their own distinguished points, "
+                      f"restarting...", flush=True)
+
+            if collisions:
+                # Collisions found! Now solve for k, all of them at once
+                k = solve_collisions(collisions, Q)
+                if k is not None:
+                    found.set()
+                    return k
+
+                # Trivial collisions, restart with different parameters
+                print(f"  Worker #{worker_id}: {len(collisions):,} trivial collisions detected, "
+                      f"restarting...", flush=True)
+
+            stuck = 0
+            for j in range(count):
+                scale = int(deltas[j, 2])
+                alphas[j] = (scale * alphas[j] + int(deltas[j, 0])) % n
+                betas[j] = (scale * betas[j] + int(deltas[j, 1])) % n
+                walk_lengths[j] += nsteps
+                if walk_lengths[j] >= max_walk_length:
+                    restarts.add(j)
+                    stuck += 1
+
+            if stuck:
+                print(f"  Worker #{worker_id}: {stuck:,} walkers stuck in cycles without distinguished points, "
+                      f"restarting...", flush=True)
+
+            if restarts:
+                indices = sorted(restarts)
+                points = []
+                for j in indices:
+                    encoded, alphas[j], betas[j] = canonicalize(next_point, next_alpha, start_beta)
+                    points.append(encoded)
+                    walk_lengths[j] = 0
+                    next_alpha += workers
+                    next_point = crypto_core_ed25519_add(next_point, offset)
+                walkers.load(indices, points)
 
             # Print progress log
-            if iteration % log_interval == 0:
+            if iteration >= next_log:
+                while next_log <= iteration:
+                    next_log += log_interval
                 current_time = time.time()
                 elapsed = current_time - last_log_time
-                ops_per_sec = log_interval / elapsed if elapsed > 0 else 0
+                ops = iteration - last_log_iteration
+                ops_per_sec = ops / elapsed if elapsed > 0 else 0
                 last_log_time = current_time
+                last_log_iteration = iteration
 
-                # Estimate remaining time
-                # Expected complexity: sqrt(pi*n/2) ≈ 2^126 operations
-                expected_ops = math.sqrt(math.pi * n / 2)
-                remaining_ops = expected_ops - iteration
-                remaining_seconds = remaining_ops / ops_per_sec if ops_per_sec > 0 else float('inf')
-
-                # Calculate progress (this will be hilariously small)
-                progress = (iteration / expected_ops) * 100
-
-                print()
-                print("  " + "─" * 60)
-                print(f"  Iteration: {iteration:,}")
-                print(f"  Speed: ~{ops_per_sec:,.0f} ops/sec")
-                print(f"  Progress: {progress:.15e}%")
-                print(f"  Estimated remaining time: {format_time_remaining(remaining_seconds)}")
-                print(f"  Status: 🐢 Tortoise and 🐇 Hare are still wandering... no collision yet!")
-                print("  " + "─" * 60)
-                print()
+                print_progress(f"Worker: #{worker_id} of {workers} ({count:,} walkers)", workers, iteration,
+                               ops_per_sec, len(dp_table))
 
             # Check max iterations
             if max_iterations and iteration >= max_iterations:
-                print(f"\n  Reached maximum iteration limit of {max_iterations:,}")
-                print("  Time to face reality: this won't work in your lifetime!")
                 break
 
     except KeyboardInterrupt:
-        print()
-        print("\n  Interrupted by user. Wise choice!")
-        print(f"  Completed {iteration:,} iterations before giving up.")
+        print(f"  Worker #{worker_id} completed {iteration:,} iterations before giving up.", flush=True)
+        raise
+
+    return None
+
+
+def run_pool_worker(target, *args) -> Optional[int]:
+    """
+    Run run_walker() or run_batch_walker() in a pool process.
+
+    The walkers report and re-raise KeyboardInterrupt. A pool process must
+    not die of it, or the pool would wait forever for its result, so here
+    the interrupt just ends the worker; the parent sees it too.
+
+    Args:
+        target: run_walker or run_batch_walker
+        *args: Arguments for target
+
+    Returns:
+        The private key k if found by this worker, None otherwise
+    """
+    try:
+        return target(*args)
+    except KeyboardInterrupt:
         return None
 
+
+def solve_ecdlp_pollard_rho(Q, max_iterations: Optional[int] = None, log_interval: int = 10**6,
+                            workers: int = 1, dp_bits: int = DEFAULT_DP_BITS, backend: str = DEFAULT_BACKEND,
+                            walkers: int = DEFAULT_BATCH_WALKERS):
+    """
+    Solve ECDLP using Pollard's Rho algorithm with distinguished points.
+
+    Given Q = k*G, find k.
+
+    Independent workers share a table of distinguished points, so the
+    search scales with the number of CPU cores. A single worker runs in
+    this process; more workers run in separate processes.
+
+    Args:
+        Q: Target public key point
+        max_iterations: Maximum iterations to attempt across all walkers (None for infinite)
+        log_interval: Print progress every N iterations of each walker
+        workers: Number of worker processes
+        dp_bits: Number of low bits that must be zero in a distinguished point
+        backend: Walk implementation, one of BACKENDS
+        walkers: Number of walkers per worker for the batch and cuda backends
+
+    Returns:
+        The private key k if found, None otherwise
+    """
+    print()
+    print("Starting Pollard's Rho algorithm...")
+    print(f"Target point Q: ({Q.x()}, {Q.y()})")
+    print(f"Group order n: {n}")
+    print(f"Bit length of n: {n.bit_length()}")
+    print(f"Workers: {workers}")
+    print(f"Distinguished points: 1 in 2^{dp_bits}")
+    print(f"Backend: {backend}")
+    if backend in ("batch", "cuda"):
+        print(f"Walkers per worker: {walkers:,}")
+    print()
+
+    # The walk itself only ever sees the compressed encoding of Q
+    q_bytes = encode_point(Q)
+
+    # The step c*G + d*Q of every partition is constant for the whole run,
+    # so each iteration is a single table lookup plus one point addition
+    steps = [step_point(c, d, q_bytes) for c, d in zip(_C, _D)]
+
+    walk = walk_to_distinguished
+    if backend == "python":
+        walk = _walker_python.walk_to_distinguished
+        steps = _walker_python.step_table(steps, _C, _D)
+    elif backend in ("numba", "batch", "cuda"):
+        # Same walk, compiled: convert the steps to field element limbs once
+        walk = _walker.walk_to_distinguished
+        steps = _walker.step_table(steps, _C, _D)
+
+    # Batch and GPU workers drive a whole batch of walkers each
+    if backend == "batch":
+        target, walker_args = run_batch_walker, (Q, _walker.BatchWalkers, steps, walkers)
+    elif backend == "cuda":
+        target, walker_args = run_batch_walker, (Q, _walker_cuda.CudaWalkers, steps, walkers)
+    else:
+        target, walker_args = run_walker, (Q, walk, steps)
+
+    # Split the iteration budget evenly between the walkers
+    worker_iterations = -(-max_iterations // workers) if max_iterations else None
+
+    # A single worker has nobody to share the table with, so it runs right
+    # here with a plain dict instead of a manager proxy, which would cost a
+    # round trip to the manager process for every distinguished point
+    if workers == 1:
+        try:
+            k = target(0, 1, *walker_args, {}, threading.Event(), worker_iterations, log_interval, dp_bits)
+        except KeyboardInterrupt:
+            print()
+            print("\n  Interrupted by user. Wise choice!")
+            return None
+        if k is not None:
+            return k
+    else:
+        # A CUDA context does not survive fork(), so GPU workers start fresh
+        context = multiprocessing.get_context("spawn" if backend == "cuda" else None)
+
+        with context.Manager() as manager:
+            dp_table = manager.dict()
+            found = manager.Event()
+
+            with context.Pool(workers) as pool:
+                results = [
+                    pool.apply_async(run_pool_worker, (
+                        target, worker_id, workers, *walker_args, dp_table, found,
+                        worker_iterations, log_interval, dp_bits,
+                    ))
+                    for worker_id in range(workers)
+                ]
+
+                try:
+                    for result in results:
+                        k = result.get()
+                        if k is not None:
+                            return k
+                except KeyboardInterrupt:
+                    # The walkers see the interrupt too; let them report before leaving
+                    pool.close()
+                    pool.join()
+                    print()
+                    print("\n  Interrupted by user. Wise choice!")
+                    return None
+
+    if max_iterations:
+        print(f"\n  Reached maximum iteration limit of {max_iterations:,}")
+        print("  Time to face reality: this won't work in your lifetime!")
+
     return None
 
 
@@ -361,9 +1041,48 @@ Examples:
         default=10**5,
         help='Print progress every N iterations (default: 100000)'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Number of parallel walker processes (default: 1)'
+    )
+    parser.add_argument(
+        '--dp-bits',
+        type=int,
+        default=DEFAULT_DP_BITS,
+        help=f'Number of zero bits that make a point distinguished, 0-32 (default: {DEFAULT_DP_BITS})'
+    )
+
+    parser.add_argument(
+        '--backend',
+        choices=BACKENDS,
+        default=DEFAULT_BACKEND,
+        help='Random walk implementation: libsodium point additions, a pure-Python walker for PyPy, '
+             'a numba-compiled walker (the building block of batch and cuda, slower than python with gmpy2), '
+             'batched numba walkers sharing one inversion per step or '
+             f'batched walkers on a CUDA GPU (default: {DEFAULT_BACKEND})'
+    )
+    parser.add_argument(
+        '--walkers',
+        type=int,
+        default=DEFAULT_BATCH_WALKERS,
+        help=f'Number of concurrent walkers per worker for --backend batch and cuda (default: {DEFAULT_BATCH_WALKERS})'
+    )
 
     args = parser.parse_args()
 
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if not 0 <= args.dp_bits <= 32:
+        parser.error("--dp-bits must be between 0 and 32")
+    if args.backend in ("numba", "batch") and _walker is None:
+        parser.error(f"--backend {args.backend} requires numba. Please install it using: pip install numba")
+    if args.backend == "cuda" and (_walker_cuda is None or not _walker_cuda.cuda.is_available()):
+        parser.error("--backend cuda requires numba and a CUDA-capable GPU")
+    if args.walkers < 1:
+        parser.error("--walkers must be at least 1")
+
     # Parse the public key
     try:
         print(f"  Parsing public key (解析公钥中): {args.public_key}")
@@ -378,7 +1097,11 @@ Examples:
     result = solve_ecdlp_pollard_rho(
         Q,
         max_iterations=args.max_iterations,
-        log_interval=args.log_interval
+        log_interval=args.log_interval,
+        workers=args.workers,
+        dp_bits=args.dp_bits,
+        backend=args.backend,
+        walkers=args.walkers
     )
 
     # Print result